@@ -1,7 +1,9 @@
 from typing import Tuple, List
+import math
 import numpy as np
 from heroes import Heroes
 from helpers import run_trials, save_results_plots
+from policy import SampleAveragePolicy, sample_categorical, sample_index, simulate
 
 def boltzmann_policy(x, tau):
     """ Returns an index sampled from the softmax probabilities with temperature tau
@@ -21,6 +23,29 @@ def boltzmann_policy(x, tau):
     return index
 
 
+class BoltzmannPolicy(SampleAveragePolicy):
+    """
+    Boltzmann action selection: heroes are sampled from the softmax of their estimated
+    values with temperature tau.
+
+    :param tau: The temperature value (𝜏).
+    :param init_value: Initial estimation of each hero's value.
+    """
+
+    def __init__(self, tau: float = 0.1, init_value: float = .0):
+        super().__init__(init_value)
+        self.tau = tau
+
+    def select(self, t: int) -> int:
+        #apply softmax with temperature tau (shifted by the max for numerical stability)
+        max_value = max(self.values)
+        return sample_index([math.exp((v - max_value) / self.tau) for v in self.values])
+
+    def select_batch(self, t: int) -> np.ndarray:
+        exp_x = np.exp((self.values - self.values.max(axis=1, keepdims=True)) / self.tau)
+        return sample_categorical(exp_x / exp_x.sum(axis=1, keepdims=True))
+
+
 def boltzmann(
     heroes: Heroes, 
     tau: float = 0.1, 
@@ -40,39 +65,7 @@ def boltzmann(
         - opt_action_record: Percentage of optimal actions selected.
     """
 
-    num_heroes = len(heroes.heroes)
-    values = [init_value] * num_heroes    # Initial action values
-    rew_record = []                       # Rewards at each timestep
-    avg_ret_record = []                   # Average reward up to each timestep
-    tot_reg_record = []                   # Total regret up to each timestep
-    opt_action_record = []                # Percentage of optimal actions selected
-    
-    total_rewards = 0
-    total_regret = 0
-
-    optimal_hero_index = np.argmax([hero['true_success_probability'] for hero in heroes.heroes])
-    optimal_reward = heroes.heroes[optimal_hero_index]['true_success_probability']
-    
-    for t in range(heroes.total_quests):
-        #select a hero based on boltzmann policy
-        selected_hero_index = boltzmann_policy(values, tau)
-        
-        reward = heroes.attempt_quest(selected_hero_index)
-        values[selected_hero_index] += (reward - values[selected_hero_index]) / (heroes.heroes[selected_hero_index]['n_quests'])
-        rew_record.append(reward)
-        
-        total_rewards += reward
-        avg_ret_record.append(total_rewards / (t + 1))
-
-        regret = optimal_reward - reward
-        total_regret += regret
-        tot_reg_record.append(total_regret)
-
-        #check if optimal hero was selected
-        opt_action = 1 if selected_hero_index == optimal_hero_index else 0
-        opt_action_record.append(opt_action_record[-1] + (opt_action - opt_action_record[-1]) / (t+1) if t>0 else opt_action) 
-    
-    return rew_record, avg_ret_record, tot_reg_record, opt_action_record
+    return simulate(heroes, BoltzmannPolicy(tau, init_value))
 
 
 
@@ -2,6 +2,33 @@ from typing import Tuple, List
 import numpy as np
 from heroes import Heroes
 from helpers import run_trials, save_results_plots
+from policy import SampleAveragePolicy, simulate
+
+
+class EpsGreedyPolicy(SampleAveragePolicy):
+    """
+    Epsilon-greedy action selection: a random hero with probability eps, otherwise the
+    hero with the highest estimated value.
+
+    :param eps: The epsilon value for exploration vs. exploitation.
+    :param init_value: Initial estimation of each hero's value.
+    """
+
+    def __init__(self, eps: float, init_value: float = .0):
+        super().__init__(init_value)
+        self.eps = eps
+
+    def select(self, t: int) -> int:
+        #choosing between exploration or exploitation based on epsilon value (max Q or random hero)
+        if np.random.rand() < self.eps:
+            return np.random.randint(len(self.values))
+        return self.values.index(max(self.values))
+
+    def select_batch(self, t: int) -> np.ndarray:
+        num_runs, num_heroes = self.values.shape
+        explore = np.random.rand(num_runs) < self.eps
+        return np.where(explore, np.random.randint(num_heroes, size=num_runs), np.argmax(self.values, axis=1))
+
 
 def eps_greedy(
     heroes: Heroes, 
@@ -21,46 +48,8 @@ def eps_greedy(
         - tot_reg_record: The total regret up to step t.
         - opt_action_record: Percentage of optimal actions selected.
     """
-    
-    num_heroes = len(heroes.heroes)
-    values = [init_value] * num_heroes    # Initial action values
-    rew_record = []                       # Rewards at each timestep
-    avg_ret_record = []                   # Average reward up to each timestep
-    tot_reg_record = []                   # Total regret up to each timestep
-    opt_action_record = []                # Percentage of optimal actions selected
-    
-    total_rewards = 0
-    total_regret = 0
 
-    optimal_hero_index = np.argmax([hero['true_success_probability'] for hero in heroes.heroes])
-    optimal_reward = heroes.heroes[optimal_hero_index]['true_success_probability']
-    
-    for t in range(heroes.total_quests):
-        #choosing between exploration or exploitation based on epsilon value (max Q or random hero)
-        if np.random.rand() < eps:
-            hero_index = np.random.randint(num_heroes)
-        else:
-            hero_index = np.argmax(values)
-        
-        #attempt quest with selected hero
-        reward = heroes.attempt_quest(hero_index)
-        rew_record.append(reward)
-        
-        #update value estimate for selected hero
-        hero_attempts = heroes.heroes[hero_index]['n_quests']
-        values[hero_index] += (reward - values[hero_index]) / hero_attempts
-        
-        total_rewards += reward
-        avg_ret_record.append(total_rewards / (t + 1))
-        
-        #calculate regret and cumulative regret
-        regret = optimal_reward - reward
-        total_regret += regret
-        tot_reg_record.append(total_regret)
-        
-        opt_action_record.append(1 if hero_index == optimal_hero_index else 0) 
-    
-    return rew_record, avg_ret_record, tot_reg_record, opt_action_record
+    return simulate(heroes, EpsGreedyPolicy(eps, init_value))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 from typing import Tuple, List
+import math
 import numpy as np
 from heroes import Heroes
 from helpers import run_trials, save_results_plots
+from policy import sample_categorical, sample_index, simulate
 
 def softmax(x, tau=1):
     """ Returns softmax probabilities with temperature tau
@@ -13,6 +15,66 @@ def softmax(x, tau=1):
     return e_x / e_x.sum(axis=0)
 
 
+class GradientBanditPolicy:
+    """
+    Gradient bandit action selection: heroes are sampled from the softmax of learned
+    preferences (logits), updated by stochastic gradient ascent on the expected reward.
+
+    :param alpha: The learning rate.
+    :param use_baseline: Whether or not use avg return as baseline.
+    """
+
+    def __init__(self, alpha: float, use_baseline: bool = True):
+        self.alpha = alpha
+        self.use_baseline = use_baseline
+
+    def reset(self, num_heroes: int) -> None:
+        self.h = [0.] * num_heroes      # init h (the logits)
+        self.total_rewards = 0
+        self.action_probabilities = None
+
+    def select(self, t: int) -> int:
+        max_h = max(self.h)
+        e_x = [math.exp(x - max_h) for x in self.h]
+        total = sum(e_x)
+        self.action_probabilities = [x / total for x in e_x]
+        return sample_index(self.action_probabilities)
+
+    def update(self, hero_index: int, reward: float, t: int) -> None:
+        self.total_rewards += reward
+
+        #calculate the baseline which is the avg reward (including this quest)
+        reward_bar = self.total_rewards / (t + 1) if self.use_baseline else 0
+
+        #update the logits for all heroes
+        step = self.alpha * (reward - reward_bar)
+        for i, p in enumerate(self.action_probabilities):
+            if i == hero_index:
+                self.h[i] += step * (1 - p)
+            else:
+                self.h[i] -= step * p
+
+    def reset_batch(self, num_heroes: int, num_runs: int) -> None:
+        self.h = np.zeros((num_runs, num_heroes))
+        self.total_rewards = np.zeros(num_runs)
+        self.action_probabilities = None
+        self.runs = np.arange(num_runs)
+
+    def select_batch(self, t: int) -> np.ndarray:
+        e_x = np.exp(self.h - self.h.max(axis=1, keepdims=True))
+        self.action_probabilities = e_x / e_x.sum(axis=1, keepdims=True)
+        return sample_categorical(self.action_probabilities)
+
+    def update_batch(self, hero_indices: np.ndarray, rewards: np.ndarray, t: int) -> None:
+        self.total_rewards += rewards
+        reward_bar = self.total_rewards / (t + 1) if self.use_baseline else 0.
+
+        #h_i -= step * p_i for every hero, and the selected one gets + step on top
+        step = (self.alpha * (rewards - reward_bar))[:, None]
+        self.h -= step * self.action_probabilities
+        self.h[self.runs, hero_indices] += step[:, 0]
+
+
 def gradient_bandit(
     heroes: Heroes, 
     alpha: float, 
@@ -32,55 +94,8 @@ def gradient_bandit(
         - opt_action_record: Percentage of optimal actions selected.
     """
 
-    num_heroes = len(heroes.heroes)
-    h = np.array([0]*num_heroes, dtype=float)  # init h (the logits)
-    rew_record = []                            # Rewards at each timestep
-    avg_ret_record = []                        # Average reward up to each timestep
-    tot_reg_record = []                        # Total regret up to each timestep
-    opt_action_record = []                     # Percentage of optimal actions selected
-    
-    reward_bar = 0
-    total_rewards = 0
-    total_regret = 0
-    optimal_action_count = 0
-
-    optimal_hero_index = np.argmax([hero['true_success_probability'] for hero in heroes.heroes])
-    optimal_reward = heroes.heroes[optimal_hero_index]['true_success_probability']
-
-    for t in range(heroes.total_quests):
-        action_probabilities = softmax(h)
-
-        hero_index = np.random.choice(np.arange(num_heroes), p=action_probabilities)
-
-        reward = heroes.attempt_quest(hero_index)
-        
-        rew_record.append(reward)
-        total_rewards += reward
+    return simulate(heroes, GradientBanditPolicy(alpha, use_baseline))
 
-        #get the average reward
-        avg_ret_record.append(total_rewards / (t + 1))
-        
-        regret = optimal_reward - reward
-        total_regret += regret
-        tot_reg_record.append(total_regret)
-
-        if hero_index == optimal_hero_index:
-            optimal_action_count += 1
-
-        opt_action_record.append(optimal_action_count / (t + 1))
-
-        #calculate the baseline which is the avg reward
-        if use_baseline:
-            reward_bar = avg_ret_record[-1]
-
-        #update the logits for all heroes
-        for i in range(num_heroes):
-            if i == hero_index:
-                h[i] += alpha * (reward - reward_bar) * (1 - action_probabilities[i])
-            else:
-                h[i] -= alpha * (reward - reward_bar) * action_probabilities[i]
-    
-    return rew_record, avg_ret_record, tot_reg_record, opt_action_record
 
 if __name__ == "__main__":
     # Define the bandit problem
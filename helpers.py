@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from policy import simulate_batch
 
 
 def run_trials(number_of_trials, heroes, bandit_method, **kwargs):
@@ -45,6 +48,107 @@ def run_trials(number_of_trials, heroes, bandit_method, **kwargs):
     return rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec
 
 
+def run_policy_trials(number_of_trials, heroes, policy):
+    """
+    Runs all trials of a policy at once through simulate_batch and returns the averaged results.
+
+    Parameters:
+    - number_of_trials (int): The number of independent simulations.
+    - heroes (Heroes): An instance of the Heroes class, representing the available heroes for the bandit problem.
+    - policy (Policy): The action selection policy (e.g., EpsGreedyPolicy(eps=0.1)).
+
+    Returns:
+    - rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec (numpy.ndarray): The averaged records, as in run_trials.
+    """
+
+    records = simulate_batch(heroes, policy, number_of_trials)
+    rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec = (record.mean(axis=0) for record in records)
+    return rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec
+
+
+def _accumulate_trials(shm_name, shape, worker_index, number_of_trials, seed, heroes, bandit_method, kwargs):
+    """
+    Worker for run_trials_parallel: runs its share of the trials and accumulates the
+    sums and sums of squares of the four records in place in its own slice of the
+    shared memory buffer.
+    """
+    np.random.seed(seed)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        sums = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[worker_index]
+
+        for _ in range(number_of_trials):
+            heroes.init_heroes()
+            records = np.asarray(bandit_method(heroes=heroes, **kwargs), dtype=np.float64)
+
+            sums[0] += records
+            sums[1] += records * records
+
+        # Release the view before closing, otherwise the buffer is still exported
+        del sums
+    finally:
+        shm.close()
+
+
+def run_trials_parallel(number_of_trials, heroes, bandit_method, n_workers=None, seed=None, return_std=False, **kwargs):
+    """
+    Same as run_trials, but spreads the trials over several processes. Each worker
+    accumulates its sums (and sums of squares) in its own slice of a shared memory
+    buffer, so no per-trial records are sent back to the parent, which only reduces
+    the slices once all workers are done.
+
+    Parameters:
+    - number_of_trials (int): The number of times to run the bandit method.
+    - heroes (Heroes): An instance of the Heroes class, representing the available heroes for the bandit problem.
+    - bandit_method (function): The bandit method to be used (e.g., eps_greedy). Must be picklable (module level).
+    - n_workers (int): Number of worker processes. Defaults to os.cpu_count(), capped at number_of_trials.
+    - seed (int): Seed used to derive an independent random stream for every worker.
+    - return_std (bool): Whether to also return the standard deviation of each record over the trials.
+    - kwargs: Additional arguments required by the bandit method.
+
+    Returns:
+    - rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec (numpy.ndarray): The averaged records, as in run_trials.
+    - If return_std is True, a second tuple with the standard deviations of the same four records.
+    """
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, number_of_trials))
+
+    # Split the trials as evenly as possible between the workers
+    trials_per_worker = [len(chunk) for chunk in np.array_split(np.arange(number_of_trials), n_workers)]
+    worker_seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n_workers)]
+
+    # One (sum, sum of squares) x 4 records slice per worker
+    shape = (n_workers, 2, 4, heroes.total_quests)
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(np.float64).itemsize)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        buffer.fill(0.)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(_accumulate_trials, shm.name, shape, i, trials_per_worker[i],
+                                       worker_seeds[i], heroes, bandit_method, kwargs)
+                       for i in range(n_workers)]
+            for future in futures:
+                future.result()
+
+        totals = buffer.sum(axis=0)
+        del buffer
+    finally:
+        shm.close()
+        shm.unlink()
+
+    means = totals[0] / number_of_trials
+    rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec = means
+
+    if not return_std:
+        return rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec
+
+    stds = np.sqrt(np.maximum(totals[1] / number_of_trials - means ** 2, 0.))
+    return (rew_rec, avg_ret_rec, tot_reg_rec, opt_act_rec), tuple(stds)
+
+
 def save_results_plots(experiments, plot_title='Experiment Results', results_folder='results', pdf_name='experiment_results.pdf'):
     """
     Create a 2x2 plot of results from multiple experiments and save it as a PDF.
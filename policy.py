@@ -0,0 +1,169 @@
+from typing import List, Protocol, Tuple
+import numpy as np
+from heroes import Heroes
+
+
+class Policy(Protocol):
+    """
+    Interface of an action selection policy that can be plugged into simulate / simulate_batch.
+
+    The batched variants run `num_runs` independent copies of the policy side by side:
+    every piece of state carries a leading run dimension.
+    """
+
+    def reset(self, num_heroes: int) -> None:
+        """Reset the policy's state for a new single simulation."""
+
+    def select(self, t: int) -> int:
+        """Return the index of the hero to send on quest t."""
+
+    def update(self, hero_index: int, reward: float, t: int) -> None:
+        """Update the policy's state with the reward obtained by hero_index on quest t."""
+
+    def reset_batch(self, num_heroes: int, num_runs: int) -> None:
+        """Reset the policy's state for num_runs independent simulations."""
+
+    def select_batch(self, t: int) -> np.ndarray:
+        """Return an array with the index of the hero chosen by every run on quest t."""
+
+    def update_batch(self, hero_indices: np.ndarray, rewards: np.ndarray, t: int) -> None:
+        """Update every run with the reward obtained by its chosen hero on quest t."""
+
+
+class SampleAveragePolicy:
+    """
+    Base class for policies that estimate each hero's value by the sample average of its
+    rewards (starting from init_value). Subclasses only implement select and select_batch.
+
+    :param init_value: Initial estimation of each hero's value.
+    """
+
+    def __init__(self, init_value: float = .0):
+        self.init_value = init_value
+
+    def reset(self, num_heroes: int) -> None:
+        self.values = [float(self.init_value)] * num_heroes    # Action values
+        self.counts = [0] * num_heroes                          # How many times each hero was selected
+
+    def update(self, hero_index: int, reward: float, t: int) -> None:
+        self.counts[hero_index] += 1
+        self.values[hero_index] += (reward - self.values[hero_index]) / self.counts[hero_index]
+
+    def reset_batch(self, num_heroes: int, num_runs: int) -> None:
+        self.values = np.full((num_runs, num_heroes), self.init_value, dtype=float)
+        self.counts = np.zeros((num_runs, num_heroes))
+        self.runs = np.arange(num_runs)
+
+    def update_batch(self, hero_indices: np.ndarray, rewards: np.ndarray, t: int) -> None:
+        self.counts[self.runs, hero_indices] += 1
+        selected_values = self.values[self.runs, hero_indices]
+        self.values[self.runs, hero_indices] += (rewards - selected_values) / self.counts[self.runs, hero_indices]
+
+
+def sample_index(weights: List[float]) -> int:
+    """
+    Sample an index with probability proportional to its (non-negative) weight.
+    """
+    u = np.random.rand() * sum(weights)
+    cum_weight = 0.
+    for i, w in enumerate(weights):
+        cum_weight += w
+        if u < cum_weight:
+            return i
+    return len(weights) - 1
+
+
+def sample_categorical(probs: np.ndarray) -> np.ndarray:
+    """
+    Sample one index per row of a (num_runs, num_heroes) array of probabilities.
+    """
+    cum_probs = np.cumsum(probs, axis=1)
+    u = np.random.rand(probs.shape[0], 1) * cum_probs[:, -1:]
+    return np.minimum((u >= cum_probs).sum(axis=1), probs.shape[1] - 1)
+
+
+def _records_from_outcomes(
+    rewards: np.ndarray,
+    optimal_choices: np.ndarray,
+    optimal_reward: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the four records from the rewards and the optimal-choice flags along the last axis.
+    """
+    steps = np.arange(1, rewards.shape[-1] + 1)
+    avg_ret_record = np.cumsum(rewards, axis=-1) / steps
+    tot_reg_record = np.cumsum(optimal_reward - rewards, axis=-1)
+    opt_action_record = np.cumsum(optimal_choices, axis=-1) / steps
+    return rewards, avg_ret_record, tot_reg_record, opt_action_record
+
+
+def simulate(
+    heroes: Heroes,
+    policy: Policy
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run a single simulation of a policy on a bandit problem.
+
+    :param heroes: A bandit problem, instantiated from the Heroes class.
+    :param policy: The action selection policy.
+    :return:
+        - rew_record: The record of rewards at each timestep.
+        - avg_ret_record: The average of rewards up to step t. For example: If
+    we define `ret_T` = \\sum^T_{t=0}{r_t}, `avg_ret_record` = ret_T / (1+T).
+        - tot_reg_record: The total regret up to step t.
+        - opt_action_record: Percentage of optimal actions selected up to step t.
+    """
+
+    num_heroes = len(heroes.heroes)
+    optimal_hero_index = np.argmax([hero['true_success_probability'] for hero in heroes.heroes])
+    optimal_reward = heroes.heroes[optimal_hero_index]['true_success_probability']
+
+    rewards = np.zeros(heroes.total_quests)
+    optimal_choices = np.zeros(heroes.total_quests)
+
+    policy.reset(num_heroes)
+    for t in range(heroes.total_quests):
+        hero_index = policy.select(t)
+        reward = heroes.attempt_quest(hero_index)
+        policy.update(hero_index, reward, t)
+
+        rewards[t] = reward
+        optimal_choices[t] = hero_index == optimal_hero_index
+
+    return _records_from_outcomes(rewards, optimal_choices, optimal_reward)
+
+
+def simulate_batch(
+    heroes: Heroes,
+    policy: Policy,
+    num_runs: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run num_runs independent simulations of a policy side by side. Quest outcomes are
+    drawn directly from the heroes' true success probabilities, so the heroes' own
+    counters are left untouched.
+
+    :param heroes: A bandit problem, instantiated from the Heroes class.
+    :param policy: The action selection policy.
+    :param num_runs: Number of independent simulations.
+    :return: The same four records as simulate, each of shape (num_runs, total_quests).
+    """
+
+    num_heroes = len(heroes.heroes)
+    true_probabilities = np.array([hero['true_success_probability'] for hero in heroes.heroes])
+    optimal_hero_index = np.argmax(true_probabilities)
+    optimal_reward = true_probabilities[optimal_hero_index]
+
+    rewards = np.zeros((num_runs, heroes.total_quests))
+    optimal_choices = np.zeros((num_runs, heroes.total_quests))
+
+    policy.reset_batch(num_heroes, num_runs)
+    for t in range(heroes.total_quests):
+        hero_indices = policy.select_batch(t)
+        step_rewards = (np.random.rand(num_runs) < true_probabilities[hero_indices]).astype(float)
+        policy.update_batch(hero_indices, step_rewards, t)
+
+        rewards[:, t] = step_rewards
+        optimal_choices[:, t] = hero_indices == optimal_hero_index
+
+    return _records_from_outcomes(rewards, optimal_choices, optimal_reward)
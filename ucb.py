@@ -1,7 +1,40 @@
 from typing import Tuple, List
+import math
 import numpy as np
 from heroes import Heroes
 from helpers import run_trials, save_results_plots
+from policy import SampleAveragePolicy, simulate
+
+
+class UCBPolicy(SampleAveragePolicy):
+    """
+    Upper Confidence Bound action selection: heroes that were never selected come first,
+    then the hero with the highest value + c * sqrt(log(t + 1) / count).
+
+    :param c: The exploration coefficient that balances exploration vs. exploitation.
+    :param init_value: Initial estimation of each hero's value.
+    """
+
+    def __init__(self, c: float, init_value: float = .0):
+        super().__init__(init_value)
+        self.c = c
+
+    def select(self, t: int) -> int:
+        #choose hero that we didnt select before
+        if 0 in self.counts:
+            return self.counts.index(0)
+
+        #or the one with the max ucb value
+        log_t = math.log(t + 1)
+        ucb_values = [v + self.c * math.sqrt(log_t / n) for v, n in zip(self.values, self.counts)]
+        return ucb_values.index(max(ucb_values))
+
+    def select_batch(self, t: int) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bonus = self.c * np.sqrt(np.log(t + 1) / self.counts)
+        ucb_values = np.where(self.counts == 0, np.inf, self.values + bonus)
+        return np.argmax(ucb_values, axis=1)
+
 
 def ucb(
     heroes: Heroes, 
@@ -22,59 +55,8 @@ def ucb(
         - opt_action_record: Percentage of optimal actions selected.
     """
 
-    num_heroes = len(heroes.heroes)
-    values = [init_value] * num_heroes   # Initial action values
-    rew_record = []                      # Rewards at each timestep
-    avg_ret_record = []                  # Average reward up to each timestep
-    tot_reg_record = []                  # Total regret up to each timestep
-    opt_action_record = []               # Percentage of optimal actions selected
-    
-    total_rewards = 0
-    total_regret = 0
-    optimal_action_count = 0
-
-    optimal_hero_index = np.argmax([hero['true_success_probability'] for hero in heroes.heroes])
-    optimal_reward = heroes.heroes[optimal_hero_index]['true_success_probability']
-    
-    #counts = how many times the hero was selected, init to 0
-    counts = [0] * num_heroes
-
-    for t in range(heroes.total_quests):
-        ucb_values = []
-        
-        #compute ucb value for heroes
-        for i in range(num_heroes):
-            if counts[i] == 0:
-                #choose hero that we didnt select before
-                ucb_value = float('inf')
-            else:
-                #or calculate the ucb value through the formula
-                ucb_value = values[i] + c * np.sqrt(np.log(t + 1) / counts[i])
-            
-            ucb_values.append(ucb_value)
-
-        #select and get reward of the hero with max ucb
-        selected_hero = np.argmax(ucb_values)
-        reward = heroes.attempt_quest(selected_hero)
-        rew_record.append(reward)
-        
-        counts[selected_hero] += 1
-        values[selected_hero] += (reward - values[selected_hero]) / counts[selected_hero]
-        
-        #update total reward and regret
-        total_rewards += reward
-        total_regret += (optimal_reward - reward)
-        
-        avg_ret_record.append(total_rewards / (t + 1))
-        tot_reg_record.append(total_regret)
-
-        if selected_hero == optimal_hero_index:
-            optimal_action_count += 1
-
-        opt_action_record.append(optimal_action_count / (t + 1))
-        
+    return simulate(heroes, UCBPolicy(c, init_value))
 
-    return rew_record, avg_ret_record, tot_reg_record, opt_action_record
 
 if __name__ == "__main__":
     # Define the bandit problem